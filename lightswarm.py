@@ -6,49 +6,88 @@ This module provides:
 - Mapping of human-readable actions to Lightswarm command codes.
 - Validation helpers for command values.
 - Functions to build and send byte-encoded payloads with checksum and framing.
+- A dedicated writer thread so HTTP handlers never block on serial I/O.
 - Thread-safe serial communication with automatic reconnection.
 
 - NOTE: CURRENTLY UNTESTED!!
 """
 
 # Standard imports:
+import collections
+import functools
+import os
+import queue
 import serial
+import struct
 import logging
 import platform
 import threading
-from functools import reduce
+from contextlib import contextmanager
+from typing import Final
 
 # Serial configuration
 baud = 115200
 lightswarm = None
-serial_lock = threading.Lock()
+_init_lock = threading.Lock()
 timeout = 1
+# File descriptor of the open port (POSIX only), cached at connect time
+# so the hot path can call os.write directly instead of going through
+# pyserial's Python-level write wrapper.
+_fd = None
+
+# Outgoing frames are handed to a single daemon writer thread via this
+# queue so request handlers never block on the serial write itself.
+_tx_queue = queue.SimpleQueue()
+_writer_thread = None
+
+# Small pool of reusable scratch buffers for assembling multi-channel
+# payloads, so fade loops do not allocate a fresh buffer per command.
+_buf_pool = collections.deque(maxlen=8)
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-
-def get_usb_port():
-    """
-    Determine the appropriate USB port for the Lightswarm based on the host
-    platform. Check designated port on hardware and change as necessary.
-
-    Return examples:
-        str: The serial port path:
-        - 'COM4' for Windows
-        - '/dev/tty.usbmodem1101' for macOS
-        - '/dev/ttyUSB0' for Linux
-    """
-    if platform.system() == 'Windows':
-        return 'COM4'
-    elif platform.system() == 'Darwin':
-        return '/dev/tty.usbmodem1101'
-    else:
-        return '/dev/ttyUSB0'
+# Lightswarm command codes, built once at import so lookups do not rebuild
+# the mapping on every call.
+_COMMAND_CODES = {
+    'nothing': 0x00,
+    'reset': 0x01,
+    'ping_request': 0x02,
+    'ping_response': 0x03,
+    'on': 0x20,  # implemented
+    'off': 0x21,  # implemented
+    'level': 0x22,  # implemented
+    'fade': 0x23,  # implemented
+    'set_pseudo': 0x25,  # implemented
+    # 'erase_pseudo': 0x26,
+    # 'media_function': 0x27,
+    # 'event_start': 0x28,
+    # 'event_stop': 0x29,
+    # 'data_forward': 0x2A,
+    # 'mech_command': 0x2B,
+    # 'set_rgb': 0x2C,
+    'toggle': 0x2D,
+    # 'flash': 0x2E,
+    # 'flash_rgb': 0x2F,
+    # 'fade_multi': 0x30,
+    # 'fade_rgb': 0x31,
+    # 'config': 0x7E
+}
 
 
-ser = get_usb_port()
+# The host platform is fixed for the life of the process, so resolve
+# the Lightswarm USB port once at import. Check designated port on
+# hardware and change as necessary:
+# - 'COM4' for Windows
+# - '/dev/tty.usbmodem1101' for macOS
+# - '/dev/ttyUSB0' for Linux
+_SYS = platform.system()
+ser: Final[str] = (
+    'COM4' if _SYS == 'Windows'
+    else '/dev/tty.usbmodem1101' if _SYS == 'Darwin'
+    else '/dev/ttyUSB0'
+)
 
 
 def get_command_code(action):
@@ -61,63 +100,49 @@ def get_command_code(action):
     Raises:
         ValueError: If the provided action is not recognized.
     """
-    codes = {
-        'nothing': 0x00,
-        'reset': 0x01,
-        'ping_request': 0x02,
-        'ping_response': 0x03,
-        'on': 0x20,  # implemented
-        'off': 0x21,  # implemented
-        'level': 0x22,  # implemented
-        'fade': 0x23,  # implemented
-        'set_pseudo': 0x25,  # implemented
-        # 'erase_pseudo': 0x26,
-        # 'media_function': 0x27,
-        # 'event_start': 0x28,
-        # 'event_stop': 0x29,
-        # 'data_forward': 0x2A,
-        # 'mech_command': 0x2B,
-        # 'set_rgb': 0x2C,
-        'toggle': 0x2D,
-        # 'flash': 0x2E,
-        # 'flash_rgb': 0x2F,
-        # 'fade_multi': 0x30,
-        # 'fade_rgb': 0x31,
-        # 'config': 0x7E
-    }
-    try:
-        return codes[action]
-    except KeyError:
+    code = _COMMAND_CODES.get(action)
+    if code is None:
         raise ValueError(f'Unknown action: {action}')
+    return code
 
 
-def check_value(input, action, bracket=None):
+def check_value(value, action, lo=None, hi=None):
     """
     Validate a numeric value for a given action.
     Args:
-        input (int): The value to validate.
+        value (int): The value to validate.
         action (str): The action name for context in error messages.
-        bracket (list[int] | None): Optional [min, max] range for validation.
+        lo (int | None): Optional inclusive lower bound.
+        hi (int | None): Optional inclusive upper bound.
     Returns:
-        int: The validated input value.
+        int: The validated value.
     Raises:
-        ValueError: If the input is missing or outside the allowed range.
-        TypeError: If the input is not an integer.
+        ValueError: If the value is missing or outside the allowed range.
+        TypeError: If the value cannot be compared against the bounds
+        (e.g. not an integer).
     """
-    if input is None:
+    if value is None:
         raise ValueError(f'Action: "{action}" is missing a required value')
-    if not isinstance(input, int):
-        raise TypeError(f'Value for "{action}" must be an integer.')
-    if bracket:
-        if len(bracket) != 2:
-            raise ValueError('Value bracket needs exactly 2 values.')
-        bracket.sort()
-        if not (bracket[0] <= input <= bracket[1]):
-            raise ValueError(
-                f'Value for "{action}" must be between '
-                f'{bracket[0]}-{bracket[1]}. Value entered: {input}.'
-            )
-    return input
+    if lo is not None and not lo <= value <= hi:
+        raise ValueError(
+            f'Value for "{action}" must be between '
+            f'{lo}-{hi}. Value entered: {value}.'
+        )
+    return value
+
+
+# Per-action extra payload layout: ordered (field, (lo, hi)) pairs, so
+# building the extra data is one table lookup instead of a chain of
+# action comparisons.
+_EXTRA_SPEC = {
+    'level': (('level', (0, 255)),),
+    'fade': (
+        ('level', (0, 255)),
+        ('interval', (1, 255)),
+        ('step', (0, 255)),
+    ),
+    'set_pseudo': (('pseudo_address', None),),
+}
 
 
 def get_extra_payload_data(command):
@@ -131,61 +156,121 @@ def get_extra_payload_data(command):
     """
     action = command['action']
     extra_payload_data = []
-    # Applying new level
-    if action == 'level':
-        new_level = command.get('level')
-        extra_payload_data.append(check_value(new_level, action, [0, 255]))
-    # Applying fade
-    if action == 'fade':
-        fade_level = command.get('level')
-        fade_interval = command.get('interval')
-        fade_step = command.get('step')
-        extra_payload_data.append(check_value(fade_level, action, [0, 255]))
-        extra_payload_data.append(check_value(fade_interval, action, [1, 255]))
-        extra_payload_data.append(check_value(fade_step, action, [0, 255]))
-    # Applying pseudo address
-    if action == 'set_pseudo':
-        pseudo_address = check_value(command.get('pseudo_address'), action)
-        first_pseudo_address_byte = (pseudo_address >> 8) & 0xFF
-        second_pseudo_address_byte = pseudo_address & 0xFF
-        extra_payload_data.extend(
-            [first_pseudo_address_byte, second_pseudo_address_byte]
-        )
-
+    for field, bounds in _EXTRA_SPEC.get(action, ()):
+        lo, hi = bounds if bounds else (None, None)
+        value = check_value(command.get(field), action, lo, hi)
+        if field == 'pseudo_address':
+            # Split pseudo address into 1 byte blocks
+            extra_payload_data.extend([(value >> 8) & 0xFF, value & 0xFF])
+        else:
+            extra_payload_data.append(value)
     return extra_payload_data
 
 
+def _xor_checksum(data):
+    """
+    XOR all bytes of `data` down to a single checksum byte.
+    Args:
+        data (bytearray | bytes): Bytes to checksum.
+    Returns:
+        int: The XOR of every byte as a single byte value.
+    Note:
+        Folds the bytes as one big integer (`int.from_bytes`) so the XOR
+        runs as a handful of C-level int operations rather than a Python
+        loop over every byte.
+    """
+    n = int.from_bytes(data, 'big')
+    while n > 0xFF:
+        n = (n >> 8) ^ (n & 0xFF)
+    return n
+
+
+@functools.lru_cache(maxsize=1024)
+def _build_frame(
+    channel, action, level=None, interval=None, step=None,
+    pseudo_address=None
+):
+    """
+    Build the fully framed payload for a single channel.
+    Args:
+        channel (int): Target channel address.
+        action (str): Action to perform.
+        level (int | None): Optional brightness level.
+        interval (int | None): Optional interval for fades.
+        step (int | None): Optional step size for fades.
+        pseudo_address (int | None): Optional pseudo-address.
+    Returns:
+        bytes: The framed and escaped payload for this channel.
+    Note:
+        Results are memoized, so repeated UI commands (e.g. toggling the
+        same channel) skip the build/checksum/framing work entirely.
+    """
+    # Create command as 1 byte block
+    command_byte = get_command_code(action)
+    # Check for custom command data to add
+    extra_payload_data = get_extra_payload_data({
+        'action': action,
+        'level': level,
+        'interval': interval,
+        'step': step,
+        'pseudo_address': pseudo_address,
+    })
+    # Pack the 16-bit light address and command byte in one C call
+    byte_array = bytearray(struct.pack('>HB', channel, command_byte))
+    byte_array.extend(extra_payload_data)
+    # Calculate checksum
+    byte_array.append(_xor_checksum(byte_array))
+    # Build payload
+    return build_payload(byte_array)
+
+
+@contextmanager
+def _get_buf():
+    """
+    Borrow a scratch bytearray from the buffer pool.
+    Yields:
+        bytearray: An empty buffer, returned to the pool (cleared) when
+        the context exits.
+    """
+    buf = _buf_pool.popleft() if _buf_pool else bytearray(64)
+    buf.clear()
+    try:
+        yield buf
+    finally:
+        _buf_pool.append(buf)
+
+
 def lightswarm_command(command):
     """
     Construct and send a Lightswarm command for one or more channels.
     Args:
-        command (dict): Command dictionary containing:
-            - 'channels' (list[int]): Target channel addresses.
-            - 'name' (str): Human-readable name for logging.
-            - 'action' (str): Action to perform.
-            - Optional fields depending on action (e.g., 'level', 'interval').
+        command: Parsed command object (e.g. the `LightswarmCommand`
+            model) with attributes:
+            - channels (list[int]): Target channel addresses.
+            - name (str): Human-readable name for logging.
+            - action (str): Action to perform.
+            - Optional fields depending on action (e.g., level, interval).
     Side Effects:
-        Calls `build_payload()` to transmit.
-    """
-    for channel in command['channels']:
-        byte_array = []
-        # Split light address into 1 byte blocks
-        first_address_byte = (channel >> 8) & 0xFF
-        second_address_byte = channel & 0xFF
-        # Create command as 1 byte block
-        command_byte = get_command_code(command['action'])
-        # Check for custom command data to add
-        extra_payload_data = get_extra_payload_data(command)
-        # Build byte_array
-        byte_array.extend(
-            [first_address_byte, second_address_byte, command_byte]
-        )
-        byte_array.extend(extra_payload_data)
-        # Calculate checksum
-        checksum_byte = reduce(lambda x, y: x ^ y, byte_array)
-        byte_array.append(checksum_byte)
-        # Build payload
-        build_payload(byte_array)
+        Calls `send_payload()` once with the framed payloads for every
+        channel concatenated, so a multi-channel command costs a single
+        serial write.
+    """
+    action = command.action
+    # Pseudo addresses change device state, so do not serve those frames
+    # from the cache.
+    build = (
+        _build_frame.__wrapped__ if action == 'set_pseudo'
+        else _build_frame
+    )
+    with _get_buf() as out:
+        for channel in command.channels:
+            out += build(
+                channel, action, getattr(command, 'level', None),
+                getattr(command, 'interval', None),
+                getattr(command, 'step', None),
+                getattr(command, 'pseudo_address', None)
+            )
+        send_payload(bytes(out))
 
 
 def build_payload(byte_array):
@@ -193,60 +278,139 @@ def build_payload(byte_array):
     Apply framing and escaping to a byte array to build a valid Lightswarm
     payload.
     Args:
-        byte_array (list[int]): Raw command bytes including checksum.
+        byte_array (bytearray | list[int]): Raw command bytes including
+        checksum.
+    Returns:
+        bytes: The framed and escaped payload.
     Raises:
         ValueError: If any byte is outside the 0–255 range.
-    Side Effects:
-        Calls `send_payload()` with the framed payload.
-    """
-    END = 0xC0
-    ESC = 0xDB
-    END_ESC = 0xDC
-    ESC_ESC = 0xDD
-
-    payload = [END]
-    for byte in byte_array:
-        if not (0 <= byte <= 255):
-            raise ValueError('8 bit value expected but not received.')
-        if byte == END:
-            payload.extend([ESC, END_ESC])
-        elif byte == ESC:
-            payload.extend([ESC, ESC_ESC])
-        else:
-            payload.append(byte)
-    payload.append(END)
-    send_payload(payload)
+    """
+    try:
+        body = bytes(byte_array)
+    except ValueError:
+        raise ValueError('8 bit value expected but not received.')
+    # Escape ESC before END so the ESC bytes inserted for END are not
+    # themselves re-escaped.
+    body = body.replace(b'\xdb', b'\xdb\xdd').replace(b'\xc0', b'\xdb\xdc')
+    return b'\xc0' + body + b'\xc0'
 
 
 def send_payload(payload):
     """
-    Send a payload to the Lightswarm device over serial.
+    Queue a payload for transmission to the Lightswarm device.
+    Args:
+        payload (bytes): Fully framed payload bytes, possibly several
+        frames concatenated.
+    Behavior:
+        Enqueues the frame and returns immediately; a single daemon
+        writer thread drains the queue and performs the actual serial
+        write, so callers never block on USB I/O.
+    """
+    _ensure_writer()
+    _tx_queue.put(bytes(payload))
+
+
+def _ensure_writer():
+    """
+    Start the daemon writer thread if it is not already running.
+    """
+    global _writer_thread
+    if _writer_thread is None or not _writer_thread.is_alive():
+        _writer_thread = threading.Thread(target=_writer_loop, daemon=True)
+        _writer_thread.start()
+
+
+def _writer_loop():
+    """
+    Drain queued frames and write them to the serial port.
+    Behavior:
+        Blocks on the queue, then coalesces any frames that arrived in
+        the meantime into a single write.
+    """
+    while True:  # pragma: no cover
+        frame = _tx_queue.get()
+        try:
+            while True:
+                frame += _tx_queue.get_nowait()
+        except queue.Empty:
+            pass
+        _write_frame(frame)
+
+
+def _get_fd(connection):
+    """
+    Return the connection's raw file descriptor, or None where one is
+    not available (Windows, or mocked connections in tests).
     Args:
-        payload (list[int]): Fully framed payload bytes.
+        connection (serial.Serial): An open serial connection.
+    Returns:
+        int | None: The file descriptor for os.write, if usable.
+    """
+    try:
+        fd = connection.fileno()
+    except Exception:
+        return None
+    return fd if isinstance(fd, int) else None
+
+
+def _write_frame(payload):
+    """
+    Write a frame to the Lightswarm device over serial.
+    Args:
+        payload (bytes): Fully framed payload bytes, possibly several
+        frames concatenated.
     Behavior:
-        - Ensures thread-safe access to the serial connection.
+        - Writes lock-free on the fast path; only (re)connecting takes
+          `_init_lock` (double-checked), and writes themselves are
+          already serialized by the single writer thread.
         - Automatically reconnects if the serial connection is lost.
         - Logs errors and resets the connection if needed.
     Raises:
         Exception: Re-raises unexpected errors after logging.
     """
-    global lightswarm
+    global lightswarm, _fd
     try:
-        with serial_lock:
-            # Reconnect if lost
-            if not lightswarm or not lightswarm.is_open:
-                lightswarm = serial.Serial(ser, baud, timeout)
-                logger.info('INFO: reconnected to lightswarm.')
-            # Send payload
-            lightswarm.write(bytes(payload))
+        # Fast path: connection already up, write without locking.
+        if not lightswarm or not lightswarm.is_open:
+            with _init_lock:
+                # Re-check: another thread may have reconnected while
+                # this one waited for the lock.
+                if not lightswarm or not lightswarm.is_open:
+                    lightswarm = serial.Serial(ser, baud, timeout)
+                    if platform.system() == 'Windows':
+                        # Default Windows driver buffers are small;
+                        # enlarge so batched multi-channel writes are not
+                        # split into byte-trickle USB transfers.
+                        lightswarm.set_buffer_size(
+                            rx_size=1 << 16, tx_size=1 << 16
+                        )
+                    _fd = _get_fd(lightswarm)
+                    logger.info('reconnected to lightswarm')
+        # Send payload, skipping pyserial's write wrapper when the raw
+        # descriptor is available. pyserial leaves the descriptor
+        # non-blocking, so os.write may accept only part of the frame
+        # once the kernel tx buffer fills: loop on the remainder so a
+        # short write never truncates the SLIP stream.
+        if _fd is not None:
+            view = memoryview(payload)
+            try:
+                while view:
+                    view = view[os.write(_fd, view):]
+            except BlockingIOError:
+                # Buffer full mid-frame: hand the remainder to
+                # pyserial's write loop, which waits for drain.
+                lightswarm.write(view)
+        else:
+            lightswarm.write(payload)
     except serial.SerialException as error:
-        logger.error(f'ERROR: Serial error: {error}')
+        logger.error('Serial error: %s', error)
         try:
             if lightswarm and lightswarm.is_open:
                 lightswarm.close()
         except serial.SerialException:
             pass
         lightswarm = None
+        _fd = None
     except Exception as error:
-        logger.error(f'ERROR: Unexpected error: {error}')
+        logger.error('Unexpected error: %s', error)
         raise
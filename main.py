@@ -8,6 +8,7 @@ This service provides:
 """
 
 # Standard imports:
+import asyncio
 import os
 # Third party imports:
 from fastapi import FastAPI
@@ -23,12 +24,10 @@ app = FastAPI()
 
 app.add_middleware(
     CORSMiddleware,
-    allow_origins=[
-        "http://localhost:8000",  # Change ports to match requirements.
-        "http://127.0.0.1:8000",  # Change ports to match requirements.
-        "http://localhost:5173",  # Change ports to match requirements.
-        "http://127.0.0.1:5173",  # Change ports to match requirements.
-    ],
+    # Compiled once by starlette; matching is a single regex check per
+    # request instead of a scan over an origin list.
+    # Change ports to match requirements.
+    allow_origin_regex=r'^http://(localhost|127\.0\.0\.1):(5173|8000)$',
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
@@ -101,7 +100,7 @@ class SK6812Command(BaseModel):
 
 
 @app.post("/lightswarm")
-def lightswarm(command: LightswarmCommand):
+async def lightswarm(command: LightswarmCommand):
     """
     Endpoint to send a Lightswarm command.
 
@@ -110,16 +109,20 @@ def lightswarm(command: LightswarmCommand):
 
     Returns:
         dict: Status message indicating success or error.
+
+    Note:
+        The command runs via `asyncio.to_thread` so the event loop can
+        keep serving requests while the serial layer does its work.
     """
     try:
-        lightswarm_command(command.model_dump())
+        await asyncio.to_thread(lightswarm_command, command)
         return {'status': 'Success'}
     except Exception as error:
         return {'status': f'Error: {error}'}
 
 
 @app.post("/sk6812")
-def sk6812(command: SK6812Command):
+async def sk6812(command: SK6812Command):
     """
     Endpoint to send a SK6812 LED strip command.
 
@@ -128,9 +131,13 @@ def sk6812(command: SK6812Command):
 
     Returns:
         dict: Status message indicating success or error.
+
+    Note:
+        The command runs via `asyncio.to_thread` so the event loop can
+        keep serving requests while the serial layer does its work.
     """
     try:
-        sk6812_command(command.model_dump())
+        await asyncio.to_thread(sk6812_command, command.model_dump())
         return {'status': 'Success'}
     except Exception as error:
         return {'status': f'Error: {error}'}
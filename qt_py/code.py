@@ -1,7 +1,9 @@
 # Standard imports:
 import json
 import logging
+import struct
 import sys
+import time
 # Third party imports:
 import neopixel  # type: ignore
 # Local imports:
@@ -22,19 +24,30 @@ pixels = neopixel.NeoPixel(
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Reusable frame of colour values. Commands are applied here first and
+# the whole frame is pushed to the strip in one slice assignment, so
+# each LED is not packed individually per command.
+frame = [(0, 0, 0, 0)] * LED_num
+
+# Header byte marking a binary command frame on the serial link:
+# 0xA5, count, then count x (index, r, g, b, w) byte records.
+FRAME_HEADER = 0xA5
+
 
 def apply_json(data):
     """
     Parse a JSON string of LED commands and apply them to the NeoPixel strip.
 
     The JSON string should represent a list of command objects. Each command
-    must contain:
-    - "index": either an integer (LED position) or the string "all"
-    - "set": a tuple/list of color values (e.g., (R, G, B) or (R, G, B, W))
+    uses short wire keys and must contain:
+    - "i": either an integer (LED position) or the string "all",
+      or "r": an inclusive [first, last] pair of LED positions
+    - "s": a tuple/list of color values (e.g., (R, G, B) or (R, G, B, W))
 
     Example JSON inputs:
-        '[{"index": 0, "set": [255, 0, 0]}]`
-        `[{"index": "all", "set": [0, 0, 255]}]'
+        '[{"i": 0, "s": [255, 0, 0]}]`
+        `[{"i": "all", "s": [0, 0, 255]}]'
+        '[{"r": [2, 5], "s": [255, 0, 0]}]'
 
     Args:
         data (str): A JSON-encoded string containing LED commands.
@@ -43,34 +56,98 @@ def apply_json(data):
         Exception: If parsing or applying the commands fails, prints an error
         message.
     """
+    # Bind hot globals once; on CircuitPython every global lookup is a
+    # dict probe that this loop would otherwise repeat per command.
+    # Cheap rejection before the parser: a valid command line always
+    # starts with '[' or '{', so noise on the serial link (log echoes,
+    # blank lines) is dropped without paying for json.loads.
+    stripped = data.lstrip()
+    if not stripped or stripped[0] not in '[{':
+        return
+    buf = frame
+    strip = pixels
     try:
-        commands = json.loads(data)
+        commands = json.loads(stripped)
         for cmd in commands:
-            i = cmd.get("index")
-            colour = cmd.get("set", 0)
+            i = cmd.get("i")
+            colour = cmd.get("s", 0)
             if i == 'all':
-                pixels.fill(colour)
+                for k in range(LED_num):
+                    buf[k] = colour
+            elif i is None:
+                # Run-length record: "r": [first, last] inclusive.
+                first, last = cmd["r"]
+                for k in range(first, last + 1):
+                    buf[k] = colour
             else:
-                pixels[i] = (colour)
-        pixels.show()
+                buf[i] = colour
+        # Apply the whole frame in one go
+        strip[:] = buf
+        strip.show()
     except Exception as e:
         logger.error("Failed to apply JSON command: %s", e)
 
 
+def apply_binary(buf):
+    """
+    Apply a packed binary frame of LED commands to the NeoPixel strip.
+
+    Each record is 5 bytes: (index, r, g, b, w). Compared to JSON lines
+    this avoids the parser and its per-command allocations, which cause
+    GC pauses (and dropped frames) on CircuitPython MCUs.
+
+    Args:
+        buf (bytes): Concatenated 5-byte command records.
+
+    Raises:
+        Exception: If unpacking or applying the records fails, logs an
+        error message.
+    """
+    # Bind hot globals once, as in apply_json.
+    out = frame
+    strip = pixels
+    try:
+        for i, r, g, b, w in struct.iter_unpack('<BBBBB', buf):
+            out[i] = (r, g, b, w)
+        strip[:] = out
+        strip.show()
+    except Exception as e:
+        logger.error("Failed to apply binary command: %s", e)
+
+
 def main() -> None:
     """
-    Continuously listen for JSON commands over the serial connection
+    Continuously listen for LED commands over the serial connection
     and apply them to the NeoPixel strip.
 
     The loop checks if there are bytes available on the serial interface.
-    When a line of input is received, it is stripped of whitespace and
-    passed to `apply_json()` for processing.
+    A leading FRAME_HEADER byte marks a compact binary frame, which is
+    read to length and passed to `apply_binary()`; anything else is
+    treated as a JSON line and passed to `apply_json()`.
 
     This function runs indefinitely until the program is stopped.
     """
+    stream = getattr(sys.stdin, 'buffer', None)
     while True:  # pragma: no cover
-        if supervisor.runtime.serial_bytes_available:
-            line = sys.stdin.readline().strip()
+        if not supervisor.runtime.serial_bytes_available:
+            # Idle: yield the core briefly instead of spinning flat
+            # out on the supervisor poll, which keeps the MCU cooler
+            # without adding visible latency at 2 ms.
+            time.sleep(0.002)
+            continue
+        if stream is None:
+            # Text-only stdin: JSON lines are all we can receive.
+            apply_json(sys.stdin.readline().strip())
+            continue
+        first = stream.read(1)
+        if not first:
+            continue
+        if first[0] == FRAME_HEADER:
+            count = stream.read(1)
+            if count:
+                apply_binary(stream.read(5 * count[0]))
+        else:
+            line = (first + stream.readline()).decode().strip()
             apply_json(line)
 
 
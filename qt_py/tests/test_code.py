@@ -1,13 +1,15 @@
 """
-Unit tests for the `apply_json` function in qt_py.code.
+Unit tests for the `apply_json` and `apply_binary` functions in qt_py.code.
 
-These tests validate that JSON commands are correctly applied to a mocked
+These tests validate that JSON and binary commands are correctly applied to a
+mocked
 NeoPixel strip. Hardware-specific modules (`neopixel`, `board`, `supervisor`)
 are patched with simple stubs so the tests can run in a standard Python
 environment without CircuitPython dependencies.
 """
 # Standard imports:
 import logging
+import struct
 import unittest
 import sys
 from types import SimpleNamespace
@@ -28,23 +30,39 @@ class MockPixels:
     """
     A mock replacement for the NeoPixel object.
 
-    This class simulates a strip of LEDs by storing colour values in a list.
-    It tracks whether `fill` and `show` have been called, allowing tests to
-    assert that commands were executed correctly.
+    This class simulates a strip of LEDs by storing colour values in one
+    flat bytearray, mirroring how the real driver keeps its pixel buffer.
+    It tracks whether `fill` and `show` have been called, allowing tests
+    to assert that commands were executed correctly.
     """
     def __init__(self, n):
-        self.data = [(0, 0, 0, 0)] * n
+        self.n = n
+        self._buf = bytearray(4 * n)
         self.fill_called = None
         self.show_called = False
 
+    @property
+    def data(self):
+        """Materialise the flat buffer as a list of (R, G, B, W) tuples."""
+        return [
+            tuple(self._buf[4 * i:4 * i + 4]) for i in range(self.n)
+        ]
+
     def __setitem__(self, i, colour):
-        """Set the colour of a single LED at index `i`."""
-        self.data[i] = tuple(colour)
+        """Set the colour of a single LED, or a slice of LEDs at once."""
+        if isinstance(i, slice):
+            flat = bytearray()
+            for c in colour:
+                flat += bytes(c)
+            self._buf[4 * (i.start or 0):4 * (i.stop or self.n)] = flat
+        else:
+            self._buf[4 * i:4 * i + 4] = bytes(colour)
 
     def fill(self, colour):
-        """Fill all LEDs with the given colour."""
-        self.fill_called = tuple(colour)
-        self.data = [tuple(colour)] * len(self.data)
+        """Fill all LEDs with the given colour, in place."""
+        t = colour if isinstance(colour, tuple) else tuple(colour)
+        self.fill_called = t
+        self._buf[:] = bytes(t) * self.n
 
     def show(self):
         """Mark that the LED strip has been updated."""
@@ -61,14 +79,16 @@ class TestApplyJson(unittest.TestCase):
     """
     def setUp(self):
         # Arrange
-        # Replace the global `pixels` object in code.py with a MockPixels.
+        # Replace the global `pixels` object in code.py with a MockPixels
+        # and clear the reusable frame left over from earlier tests.
         code.pixels = MockPixels(10)
+        code.frame[:] = [(0, 0, 0, 0)] * code.LED_num
         # Setting log level to CRITICAL to effectively silence logs in test.
         logging.getLogger('qt_py.code').setLevel(logging.CRITICAL)
 
     def test_fill_all_leds(self):
         # Act - set the colour of all leds to (1, 10, 19, 82)
-        apply_json('[{"index": "all", "set": [1, 10, 19, 82]}]')
+        apply_json('[{"i": "all", "s": [1, 10, 19, 82]}]')
         # Assert
         self.assertTrue(
             all(c == (1, 10, 19, 82) for c in code.pixels.data)
@@ -77,7 +97,7 @@ class TestApplyJson(unittest.TestCase):
 
     def test_single_led(self):
         # Act - set the colour of led 0 to (255, 0, 0, 0)
-        apply_json('[{"index": 0, "set": [255, 0, 0, 0]}]')
+        apply_json('[{"i": 0, "s": [255, 0, 0, 0]}]')
         # Assert
         self.assertEqual(code.pixels.data[0], (255, 0, 0, 0))
         self.assertTrue(code.pixels.show_called)
@@ -85,13 +105,23 @@ class TestApplyJson(unittest.TestCase):
     def test_multiple_commands(self):
         # Act - set the colour of two channels to different colours
         apply_json(
-            '[{"index": 0, "set": [255, 0, 0, 0]},'
-            '{"index": 1, "set": [0, 0, 0, 255]}]'
+            '[{"i": 0, "s": [255, 0, 0, 0]},'
+            '{"i": 1, "s": [0, 0, 0, 255]}]'
         )
         # Assert
         self.assertEqual(code.pixels.data[0], (255, 0, 0, 0))
         self.assertEqual(code.pixels.data[1], (0, 0, 0, 255))
 
+    def test_range_of_leds(self):
+        # Act - set the colour of leds 2 through 5 to (255, 0, 0, 0)
+        apply_json('[{"r": [2, 5], "s": [255, 0, 0, 0]}]')
+        # Assert
+        self.assertTrue(
+            all(code.pixels.data[k] == (255, 0, 0, 0) for k in range(2, 6))
+        )
+        self.assertEqual(code.pixels.data[1], (0, 0, 0, 0))
+        self.assertTrue(code.pixels.show_called)
+
     def test_invalid_json(self):
         # Act - send an invalid input
         apply_json('not a json string')
@@ -99,5 +129,46 @@ class TestApplyJson(unittest.TestCase):
         self.assertFalse(code.pixels.show_called)
 
 
+class TestApplyBinary(unittest.TestCase):
+    """
+    Test suite for the `apply_binary` function.
+
+    Each test verifies that packed binary command records are correctly
+    unpacked and applied to the mocked NeoPixel strip, and that malformed
+    frames are handled gracefully without raising exceptions.
+    """
+    def setUp(self):
+        # Arrange
+        # Replace the global `pixels` object in code.py with a MockPixels
+        # and clear the reusable frame left over from earlier tests.
+        code.pixels = MockPixels(10)
+        code.frame[:] = [(0, 0, 0, 0)] * code.LED_num
+        # Setting log level to CRITICAL to effectively silence logs in test.
+        logging.getLogger('qt_py.code').setLevel(logging.CRITICAL)
+
+    def test_single_record(self):
+        # Act - set the colour of led 0 to (255, 0, 0, 0)
+        code.apply_binary(struct.pack('<BBBBB', 0, 255, 0, 0, 0))
+        # Assert
+        self.assertEqual(code.pixels.data[0], (255, 0, 0, 0))
+        self.assertTrue(code.pixels.show_called)
+
+    def test_multiple_records(self):
+        # Act - set the colour of two channels to different colours
+        code.apply_binary(
+            struct.pack('<BBBBB', 0, 255, 0, 0, 0)
+            + struct.pack('<BBBBB', 1, 0, 0, 0, 255)
+        )
+        # Assert
+        self.assertEqual(code.pixels.data[0], (255, 0, 0, 0))
+        self.assertEqual(code.pixels.data[1], (0, 0, 0, 255))
+
+    def test_truncated_frame(self):
+        # Act - send a frame that is not a whole number of records
+        code.apply_binary(b'\x00\xff')
+        # Assert
+        self.assertFalse(code.pixels.show_called)
+
+
 if __name__ == "__main__":
     unittest.main()
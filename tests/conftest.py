@@ -0,0 +1,74 @@
+"""
+Shared fixtures for the lighting service test suite.
+
+Provides the canonical payload and mocked-serial objects the
+send_payload tests all need, plus an autouse reset so module-level
+serial state and the memoized USB port never leak between tests.
+"""
+# Third party imports:
+import pytest
+# Local imports:
+import sk6812
+
+
+class FakeSerial:
+    """
+    A lightweight stand-in for serial.Serial with the shape the
+    send_payload tests need (is_open, write, close). Unlike MagicMock
+    it records only what the tests assert on, so construction and
+    attribute access stay cheap as the suite grows.
+    """
+    __slots__ = (
+        'is_open', 'write_calls', 'close_calls',
+        'write_side_effect', 'close_side_effect'
+    )
+
+    def __init__(self, is_open=True):
+        self.is_open = is_open
+        self.write_calls = []
+        self.close_calls = 0
+        self.write_side_effect = None
+        self.close_side_effect = None
+
+    def write(self, data):
+        """Record the written bytes, or raise the configured error."""
+        if self.write_side_effect is not None:
+            raise self.write_side_effect
+        # Snapshot the buffer: callers may reuse it after the write.
+        self.write_calls.append(bytes(data))
+
+    def close(self):
+        """Count the close, then raise the configured error if any."""
+        self.close_calls += 1
+        if self.close_side_effect is not None:
+            raise self.close_side_effect
+
+
+@pytest.fixture(autouse=True)
+def reset_sk6812_state():
+    """
+    Clear the memoized USB port and drop any ledstrip connection around
+    each test, so monkeypatched platforms resolve fresh and mocked
+    connections do not leak into later cases.
+    """
+    sk6812.get_usb_port.cache_clear()
+    sk6812.ledstrip = None
+    yield
+    sk6812.get_usb_port.cache_clear()
+    sk6812.ledstrip = None
+
+
+@pytest.fixture
+def red_payload():
+    """
+    A canonical single-record payload: channel 0 set to red.
+    """
+    return [sk6812.PixelCmd((255, 0, 0, 0), 255, 1, index=0)]
+
+
+@pytest.fixture
+def open_ledstrip():
+    """
+    A fake open serial connection for the LED strip.
+    """
+    return FakeSerial()
@@ -4,12 +4,13 @@ Unit tests for the Lightswarm serial interface module.
 This test suite verifies:
 - Platform‑specific USB port detection (Windows, macOS, Linux).
 - Mapping of human‑readable command names to Lightswarm command codes.
-- Validation logic for numeric values with and without brackets.
+- Validation logic for numeric values with and without bounds.
 - Construction of extra payload data for supported actions
     (level, fade, set_pseudo).
 - End‑to‑end payload building, including checksum calculation, framing, and
     escaping.
-- Thread‑safe serial communication behavior in send_payload:
+- Queueing of frames in send_payload for the writer thread.
+- Thread‑safe serial communication behavior in _write_frame:
   * Successful reconnection and write.
   * Handling of SerialException during connection, write, and close.
   * Behavior with existing open connections.
@@ -19,6 +20,8 @@ The tests use pytest and unittest.mock to isolate functionality and
 simulate serial port interactions, ensuring correctness without hardware.
 """
 # Standard imports:
+import importlib
+from types import SimpleNamespace
 from unittest.mock import patch, MagicMock
 # Third party imports:
 import pytest
@@ -26,34 +29,25 @@ import pytest
 import lightswarm
 
 
-def test_get_usb_port_windows(monkeypatch):
+@pytest.mark.parametrize('system, port', [
+    ('Windows', 'COM4'),
+    ('Darwin', '/dev/tty.usbmodem1101'),
+    ('Linux', '/dev/ttyUSB0'),
+])
+def test_usb_port(monkeypatch, system, port):
     """
-    Ensure Windows platform resolves to COM4 USB port.
+    Ensure each platform resolves to its expected USB port.
     """
     # Arrange
-    monkeypatch.setattr(lightswarm.platform, 'system', lambda: 'Windows')
-    # Assert
-    assert lightswarm.get_usb_port() == 'COM4'
-
-
-def test_get_usb_port_darwin(monkeypatch):
-    """
-    Ensure macOS (Darwin) platform resolves to /dev/tty.usbmodem1101.
-    """
-    # Arrange
-    monkeypatch.setattr(lightswarm.platform, 'system', lambda: 'Darwin')
-    # Assert
-    assert lightswarm.get_usb_port() == '/dev/tty.usbmodem1101'
-
-
-def test_get_usb_port_linux(monkeypatch):
-    """
-    Ensure Linux platform resolves to /dev/ttyUSB0.
-    """
-    # Arrange
-    monkeypatch.setattr(lightswarm.platform, 'system', lambda: 'Linux')
-    # Assert
-    assert lightswarm.get_usb_port() == '/dev/ttyUSB0'
+    monkeypatch.setattr(lightswarm.platform, 'system', lambda: system)
+    try:
+        # Act - the port is resolved at import, so reload the module
+        importlib.reload(lightswarm)
+        # Assert
+        assert lightswarm.ser == port
+    finally:
+        monkeypatch.undo()
+        importlib.reload(lightswarm)
 
 
 def test_get_command_code_valid():
@@ -90,54 +84,41 @@ def test_check_value_no_input():
 
 def test_check_value_non_integer():
     """
-    Verify that non-integer input raises TypeError with a descriptive message.
-    """
-    # Act
-    with pytest.raises(TypeError) as error:
-        lightswarm.check_value('not an integer', 'test')
-    # Assert
-    assert 'Value for "test" must be an integer.' in str(error)
-
-
-def test_check_value_with_invalid_bracket():
-    """
-    Verify that a bracket list of invalid length raises ValueError.
+    Verify that non-integer input raises TypeError when compared against
+    the bounds.
     """
-    # Act
-    with pytest.raises(ValueError) as error:
-        lightswarm.check_value(100, 'test', [10])
-    # Assert
-    assert 'Value bracket needs exactly 2 values.' in str(error)
+    # Act / Assert
+    with pytest.raises(TypeError):
+        lightswarm.check_value('not an integer', 'test', 0, 255)
 
 
-def test_check_value_not_in_bracket():
+def test_check_value_not_in_bounds():
     """
-    Verify that an integer outside the allowed bracket range raises ValueError.
+    Verify that an integer outside the allowed bounds raises ValueError.
     """
     # Act
     with pytest.raises(ValueError) as error:
-        lightswarm.check_value(50, 'test', [100, 120])
+        lightswarm.check_value(50, 'test', 100, 120)
     # Assert
     assert 'Value for "test" must be between 100-120' in str(error)
 
 
-def test_check_value_with_valid_inputs_with_bracket():
+def test_check_value_with_valid_inputs_with_bounds():
     """
-    Verify that a valid integer within the bracket range is returned unchanged.
+    Verify that a valid integer within the bounds is returned unchanged.
     """
     # Act
-    returnedValue = lightswarm.check_value(50, 'test', [20, 100])
+    returnedValue = lightswarm.check_value(50, 'test', 20, 100)
     # Assert
     assert returnedValue == 50
 
 
-def test_check_value_with_valid_inputs_with_reversed_bracket():
+def test_check_value_without_bounds():
     """
-    Verify that a valid integer within a unordered bracket range is returned
-    unchanged.
+    Verify that a present value passes through when no bounds are given.
     """
     # Act
-    returnedValue = lightswarm.check_value(50, 'test', [75, 2])
+    returnedValue = lightswarm.check_value(50, 'test')
     # Assert
     assert returnedValue == 50
 
@@ -206,18 +187,18 @@ def test_lightswarm_command_builds_payload(mock_send):
     action and passes it to send_payload().
     """
     # Arrange
-    command = {
-        'name': 'test',
-        'channels': [10],
-        'action': 'level',
-        'level': 100,
-    }
+    command = SimpleNamespace(
+        name='test',
+        channels=[10],
+        action='level',
+        level=100,
+    )
     # Act
     lightswarm.lightswarm_command(command)
     # Assert
     mock_send.assert_called_once()
     payload = mock_send.call_args[0][0]
-    assert payload == [0xC0, 0x00, 0x0A, 0x22, 0x64, 0x4C, 0xC0]
+    assert payload == bytes([0xC0, 0x00, 0x0A, 0x22, 0x64, 0x4C, 0xC0])
 
 
 def test_build_payload_invalid_byte():
@@ -231,8 +212,7 @@ def test_build_payload_invalid_byte():
     assert '8 bit value expected but not received.' in str(error)
 
 
-@patch('lightswarm.send_payload')
-def test_build_payload_with_END_matching_byte(mock_send):
+def test_build_payload_with_END_matching_byte():
     """
     Verify that build_payload escapes END (0xC0) correctly in the payload.
     """
@@ -240,15 +220,12 @@ def test_build_payload_with_END_matching_byte(mock_send):
     END = 0xC0
     byte_array = [END]
     # Act
-    lightswarm.build_payload(byte_array)
+    payload = lightswarm.build_payload(byte_array)
     # Assert
-    mock_send.assert_called_once()
-    payload = mock_send.call_args[0][0]
-    assert payload == [END, 0xDB, 0xDC, END]
+    assert payload == bytes([END, 0xDB, 0xDC, END])
 
 
-@patch('lightswarm.send_payload')
-def test_build_payload_with_ESC_matching_byte(mock_send):
+def test_build_payload_with_ESC_matching_byte():
     """
     Verify that build_payload escapes ESC (0xDB) correctly in the payload.
     """
@@ -256,93 +233,105 @@ def test_build_payload_with_ESC_matching_byte(mock_send):
     ESC = 0xDB
     byte_array = [ESC]
     # Act
-    lightswarm.build_payload(byte_array)
+    payload = lightswarm.build_payload(byte_array)
     # Assert
-    mock_send.assert_called_once()
-    payload = mock_send.call_args[0][0]
-    assert payload == [0xC0, ESC, 0xDD, 0xC0]
+    assert payload == bytes([0xC0, ESC, 0xDD, 0xC0])
+
+
+def test_send_payload_enqueues_frame(monkeypatch):
+    """
+    Verify that send_payload hands the frame to the writer queue as bytes
+    without writing to serial itself.
+    """
+    # Arrange
+    monkeypatch.setattr(lightswarm, '_ensure_writer', lambda: None)
+    payload = bytes([0xC0, 0x00, 0x0A, 0x22, 0x64, 0x4C, 0xC0])
+    # Act
+    lightswarm.send_payload(payload)
+    # Assert
+    assert lightswarm._tx_queue.get_nowait() == payload
 
 
 @patch('lightswarm.serial.Serial')
-def test_send_payload_success(mock_serial, caplog):
+def test_write_frame_success(mock_serial, caplog):
     """
-    Verify that send_payload reconnects when lightswarm is None, logs INFO,
+    Verify that _write_frame reconnects when lightswarm is None, logs INFO,
     and writes the payload bytes to the serial port.
     """
     # Arrange
     mock_instance = MagicMock()
     mock_instance.is_open = True
     mock_serial.return_value = mock_instance
-    payload = [0xC0, 0x00, 0x0A, 0x22, 0x64, 0x4C, 0xC0]
+    payload = bytes([0xC0, 0x00, 0x0A, 0x22, 0x64, 0x4C, 0xC0])
     lightswarm.lightswarm = None
     # Act
     with caplog.at_level('INFO'):
-        lightswarm.send_payload(payload)
+        lightswarm._write_frame(payload)
     # Assert
-    assert 'INFO: reconnected to lightswarm.' in caplog.text
+    assert 'reconnected to lightswarm' in caplog.text
     mock_serial.assert_called_once_with(
         lightswarm.ser, lightswarm.baud, lightswarm.timeout
     )
-    mock_instance.write.assert_called_once_with(bytes(payload))
+    mock_instance.write.assert_called_once_with(payload)
 
 
 @patch('lightswarm.serial.Serial')
-def test_send_payload_serial_exception(mock_serial, caplog):
+def test_write_frame_serial_exception(mock_serial, caplog):
     """
     Verify that a SerialException during connection logs an error and resets
     lightswarm to None.
     """
     # Arrange
     mock_serial.side_effect = lightswarm.serial.SerialException('Port error')
-    payload = [0xC0, 0x00, 0x0A, 0x22, 0x64, 0x4C, 0xC0]
+    payload = bytes([0xC0, 0x00, 0x0A, 0x22, 0x64, 0x4C, 0xC0])
     lightswarm.lightswarm = None
     # Act
     with caplog.at_level('ERROR'):
-        lightswarm.send_payload(payload)
+        lightswarm._write_frame(payload)
     # Assert
-    assert "ERROR: Serial error: Port error" in caplog.text
+    assert "Serial error: Port error" in caplog.text
     assert lightswarm.lightswarm is None
 
 
 @patch('lightswarm.serial.Serial')
-def test_send_payload_existing_connection(mock_serial, caplog):
+def test_write_frame_existing_connection(mock_serial, caplog):
     """
-    Verify that with an existing open connection, send_payload writes directly
+    Verify that with an existing open connection, _write_frame writes directly
     without attempting reconnection.
     """
     # Arrange
     mock_lightswarm = MagicMock()
     mock_lightswarm.is_open = True
     lightswarm.lightswarm = mock_lightswarm
-    payload = [0xC0, 0x00, 0x0A, 0x22, 0x64, 0x4C, 0xC0]
+    payload = bytes([0xC0, 0x00, 0x0A, 0x22, 0x64, 0x4C, 0xC0])
     # Act
     with caplog.at_level("INFO"):
-        lightswarm.send_payload(payload)
+        lightswarm._write_frame(payload)
     # Assert
-    assert "INFO: reconnected to leds." not in caplog.text
-    mock_lightswarm.write.assert_called_once_with(bytes(payload))
+    assert 'reconnected to leds' not in caplog.text
+    mock_lightswarm.write.assert_called_once_with(payload)
     mock_serial.assert_not_called()
 
 
 @patch("lightswarm.serial.Serial")
-def test_send_payload_unexpected_exception(mock_serial, caplog):
+def test_write_frame_unexpected_exception(mock_serial, caplog):
     """
-    Verify that unexpected exceptions are logged and re-raised by send_payload.
+    Verify that unexpected exceptions are logged and re-raised by _write_frame.
     """
     # Arrange
     lightswarm.lightswarm = None
     mock_serial.side_effect = Exception("Something went wrong")
-    payload = [0xC0, 0x00, 0x0A, 0x22, 0x64, 0x4C, 0xC0]
+    payload = bytes([0xC0, 0x00, 0x0A, 0x22, 0x64, 0x4C, 0xC0])
     # Act
     with caplog.at_level("ERROR"):
         with pytest.raises(Exception, match="Something went wrong"):
-            lightswarm.send_payload(payload)
+            lightswarm._write_frame(payload)
     # Assert
-    assert "ERROR: Unexpected error: Something went wrong" in caplog.text
+    assert "Unexpected error: Something went wrong" in caplog.text
 
 
 @patch("lightswarm.serial.Serial")
-def test_send_payload_serial_exception_with_open_lightswarm(
+def test_write_frame_serial_exception_with_open_lightswarm(
     mock_serial, caplog
 ):
     """
@@ -357,18 +346,18 @@ def test_send_payload_serial_exception_with_open_lightswarm(
     )
     lightswarm.lightswarm = mock_lightswarm
     mock_serial.return_value = mock_lightswarm
-    payload = [0xC0, 0x00, 0x0A, 0x22, 0x64, 0x4C, 0xC0]
+    payload = bytes([0xC0, 0x00, 0x0A, 0x22, 0x64, 0x4C, 0xC0])
     # Act
     with caplog.at_level("ERROR"):
-        lightswarm.send_payload(payload)
+        lightswarm._write_frame(payload)
     # Assert
     mock_lightswarm.close.assert_called_once()
     assert lightswarm.lightswarm is None
-    assert "ERROR: Serial error: Write error" in caplog.text
+    assert "Serial error: Write error" in caplog.text
 
 
 @patch("lightswarm.serial.Serial")
-def test_send_payload_close_raises_serial_exception(mock_serial, caplog):
+def test_write_frame_close_raises_serial_exception(mock_serial, caplog):
     """
     Verify that if closing the connection also raises SerialException,
     lightswarm is still reset to None and error is logged.
@@ -384,10 +373,10 @@ def test_send_payload_close_raises_serial_exception(mock_serial, caplog):
     )
     lightswarm.lightswarm = mock_lightswarm
     mock_serial.return_value = mock_lightswarm
-    payload = [0xC0, 0x00, 0x0A, 0x22, 0x64, 0x4C, 0xC0]
+    payload = bytes([0xC0, 0x00, 0x0A, 0x22, 0x64, 0x4C, 0xC0])
     # Act
     with caplog.at_level("ERROR"):
-        lightswarm.send_payload(payload)
+        lightswarm._write_frame(payload)
     # Assert
     mock_lightswarm.close.assert_called_once()
     assert lightswarm.lightswarm is None
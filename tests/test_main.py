@@ -9,22 +9,30 @@ cases.
 
 Hardware‑dependent functions (`lightswarm_command` and `sk6812_command`) are
 mocked to ensure tests run safely and deterministically without requiring
-physical devices. The FastAPI TestClient is used to simulate HTTP requests
-and validate responses.
+physical devices. A single module-scoped FastAPI TestClient simulates HTTP
+requests, so the ASGI lifespan machinery is entered once for the whole file
+rather than rebuilt per test.
 """
 # Standard imports:
 import os
 # Third party imports:
+import pytest
 from fastapi.testclient import TestClient
-from unittest.mock import patch
+from unittest.mock import MagicMock
 # Local imports:
 from main import app
 
-# Set up test client
-client = TestClient(app)
+
+@pytest.fixture(scope='module')
+def client():
+    """
+    Share one TestClient session across every test in this module.
+    """
+    with TestClient(app) as c:
+        yield c
 
 
-def test_serve_index(tmp_path, monkeypatch):
+def test_serve_index(client, tmp_path, monkeypatch):
     """
     Test serving the index.html file at the root endpoint.
 
@@ -45,8 +53,7 @@ def test_serve_index(tmp_path, monkeypatch):
     assert 'Test' in response.text
 
 
-@patch('main.lightswarm_command')
-def test_lightswarm_success(mock_command):
+def test_lightswarm_success(client, monkeypatch):
     """
     Test the /lightswarm endpoint with a valid payload.
 
@@ -56,7 +63,8 @@ def test_lightswarm_success(mock_command):
     - Ensures the mocked command was called once.
     """
     # Arrange
-    mock_command.return_value = None
+    mock_command = MagicMock(return_value=None)
+    monkeypatch.setattr('main.lightswarm_command', mock_command)
     payload = {
         'name': 'test',
         'channels': [1, 2],
@@ -71,8 +79,7 @@ def test_lightswarm_success(mock_command):
     mock_command.assert_called_once()
 
 
-@patch('main.lightswarm_command')
-def test_lightswarm_error(mock_command):
+def test_lightswarm_error(client, monkeypatch):
     """
     Test the /lightswarm endpoint when the command raises an exception.
 
@@ -82,7 +89,8 @@ def test_lightswarm_error(mock_command):
     'Error:' status message.
     """
     # Arrange
-    mock_command.side_effect = Exception('Hardware failure')
+    mock_command = MagicMock(side_effect=Exception('Hardware failure'))
+    monkeypatch.setattr('main.lightswarm_command', mock_command)
     payload = {
         'name': 'test',
         'channels': [4],
@@ -96,8 +104,7 @@ def test_lightswarm_error(mock_command):
     assert 'Error:' in response.json()['status']
 
 
-@patch('main.sk6812_command')
-def test_sk6812_success(mock_command):
+def test_sk6812_success(client, monkeypatch):
     """
     Test the /sk6812 endpoint with a valid payload.
 
@@ -107,7 +114,8 @@ def test_sk6812_success(mock_command):
     - Ensures the mocked command was called once.
     """
     # Arrange
-    mock_command.return_value = None
+    mock_command = MagicMock(return_value=None)
+    monkeypatch.setattr('main.sk6812_command', mock_command)
     payload = {
         'name': 'test',
         'channels': [1, 2],
@@ -123,8 +131,7 @@ def test_sk6812_success(mock_command):
     mock_command.assert_called_once()
 
 
-@patch('main.sk6812_command')
-def test_sk6812_error(mock_command):
+def test_sk6812_error(client, monkeypatch):
     """
     Test the /sk6812 endpoint when the command raises an exception.
 
@@ -134,7 +141,8 @@ def test_sk6812_error(mock_command):
     'Error:' status message.
     """
     # Arrange
-    mock_command.side_effect = Exception('Hardware failure')
+    mock_command = MagicMock(side_effect=Exception('Hardware failure'))
+    monkeypatch.setattr('main.sk6812_command', mock_command)
     payload = {
         'name': 'test',
         'channels': [1, 2],
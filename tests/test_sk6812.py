@@ -28,42 +28,51 @@ platforms, produces correct LED control payloads, and handles serial
 communication errors gracefully.
 """
 # Standard imports:
-import json
-from unittest.mock import patch, MagicMock
+from unittest.mock import patch
 # Third party imports:
 import pytest
 # Local imports:
 import sk6812
 
+# Canonical wire form of the red_payload fixture, precomputed once so
+# the success test compares written bytes directly instead of paying a
+# decode/strip/json.loads round trip per run.
+EXPECTED_RED_FRAME = b'[{"i":0,"s":[255,0,0,0],"b":255,"e":1}]\n'
 
-def test_get_usb_port_windows(monkeypatch):
+
+@pytest.fixture(scope='module')
+def mock_serial_cls():
     """
-    Ensure Windows platform resolves to COM4 USB port.
+    Patch serial.Serial in sk6812 once for this module, instead of
+    paying a patch/unpatch cycle per test.
     """
-    # Arrange
-    monkeypatch.setattr(sk6812.platform, 'system', lambda: 'Windows')
-    # Assert
-    assert sk6812.get_usb_port() == 'COM4'
+    with patch('sk6812.serial.Serial') as mock:
+        yield mock
 
 
-def test_get_usb_port_darwin(monkeypatch):
+@pytest.fixture(autouse=True)
+def reset_mock_serial(mock_serial_cls):
     """
-    Ensure macOS (Darwin) platform resolves to /dev/tty.usbmodem1101.
+    Clear recorded calls and configured behaviour on the shared mock
+    between tests.
     """
-    # Arrange
-    monkeypatch.setattr(sk6812.platform, 'system', lambda: 'Darwin')
-    # Assert
-    assert sk6812.get_usb_port() == '/dev/tty.usbmodem1101'
+    mock_serial_cls.reset_mock(return_value=True, side_effect=True)
+    yield
 
 
-def test_get_usb_port_linux(monkeypatch):
+@pytest.mark.parametrize('system, port', [
+    ('Windows', 'COM4'),
+    ('Darwin', '/dev/tty.usbmodem1101'),
+    ('Linux', '/dev/ttyUSB0'),
+])
+def test_get_usb_port(monkeypatch, system, port):
     """
-    Ensure Linux platform resolves to /dev/ttyUSB0.
+    Ensure each platform resolves to its expected USB port.
     """
     # Arrange
-    monkeypatch.setattr(sk6812.platform, 'system', lambda: 'Linux')
+    monkeypatch.setattr(sk6812.platform, 'system', lambda: system)
     # Assert
-    assert sk6812.get_usb_port() == '/dev/ttyUSB0'
+    assert sk6812.get_usb_port() == port
 
 
 def test_get_command_code_valid():
@@ -84,13 +93,13 @@ def test_get_command_code_invalid():
         sk6812.get_command_code('rainbow')
 
 
-@patch('sk6812.send_payload')
-def test_sk6812_command_builds_payload(mock_send):
+def test_sk6812_command_builds_payload(monkeypatch):
     """
     Ensure sk6812_command builds payload with correct colour, brightness,
-    and effect.
+    and effect and queues it for the writer thread.
     """
     # Arrange
+    monkeypatch.setattr(sk6812, '_ensure_writer', lambda: None)
     command = {
         'name': 'test',
         'channels': [0, 1, 2],
@@ -101,167 +110,161 @@ def test_sk6812_command_builds_payload(mock_send):
     # Act
     sk6812.sk6812_command(command)
     # Assert
-    mock_send.assert_called_once()
-    payload = mock_send.call_args[0][0]
-    assert payload[0]['set'] == (253, 244, 220, 0)
-    assert payload[0]['brightness'] == 0.5
-    assert payload[0]['effect'] == 'on'
+    payload = sk6812._tx_ring.popleft()
+    assert payload[0].rgbw == (253, 244, 220, 0)
+    assert payload[0].brightness == 128
+    assert payload[0].effect == 1
+
+
+def test_sk6812_command_collapses_consecutive_channels(monkeypatch):
+    """
+    Ensure runs of consecutive channels collapse into one range record
+    while isolated channels keep their own index record.
+    """
+    # Arrange
+    monkeypatch.setattr(sk6812, '_ensure_writer', lambda: None)
+    command = {
+        'name': 'test',
+        'channels': [0, 1, 2, 7],
+        'colour': 'red',
+        'brightness': 1.0,
+        'effect': 'on'
+    }
+    # Act
+    sk6812.sk6812_command(command)
+    # Assert
+    payload = sk6812._tx_ring.popleft()
+    assert len(payload) == 2
+    assert payload[0].span == [0, 2]
+    assert payload[1].index == 7
+
+
+def test_flush_waits_for_writer(mock_serial_cls, open_ledstrip):
+    """
+    Ensure flush() returns only once the real writer thread has drained
+    the queued command and written the frame to the serial connection.
+    """
+    # Arrange
+    sk6812.ledstrip = open_ledstrip
+    command = {
+        'name': 'test',
+        'channels': [0],
+        'colour': 'red',
+        'brightness': 1.0,
+        'effect': 'on'
+    }
+    # Act - enqueue through the real writer thread, then wait for it
+    sk6812.sk6812_command(command)
+    sk6812.flush()
+    # Assert - the frame was on the wire before flush returned
+    assert open_ledstrip.write_calls == [EXPECTED_RED_FRAME]
+    mock_serial_cls.assert_not_called()
 
 
-@patch('sk6812.serial.Serial')
-def test_send_payload_success(mock_serial, caplog):
+def test_send_payload_success(
+    mock_serial_cls, caplog, red_payload, open_ledstrip
+):
     """
     Verify successful payload send logs reconnection and writes JSON to serial.
     """
     # Arrange
-    mock_instance = MagicMock()
-    mock_instance.is_open = True
-    mock_serial.return_value = mock_instance
-    payload = [
-        {
-            "index": 0,
-            "set": (255, 0, 0, 0),
-            "brightness": 1.0,
-            "effect": "on"
-        }]
+    mock_instance = open_ledstrip
+    mock_serial_cls.return_value = mock_instance
     sk6812.ledstrip = None
     # Act
     with caplog.at_level('INFO'):
-        sk6812.send_payload(payload)
+        sk6812.send_payload(red_payload)
     # Assert
-    assert 'INFO: reconnected to leds.' in caplog.text
-    mock_serial.assert_called_once_with(sk6812.ser, sk6812.baud)
-    mock_instance.write.assert_called_once()
-    written = mock_instance.write.call_args[0][0].decode().strip()
-    decoded = json.loads(written)
-    assert decoded == [
-        {"index": 0, "set": [255, 0, 0, 0], "brightness": 1.0, "effect": "on"}
-    ]
+    assert 'reconnected to leds' in caplog.text
+    mock_serial_cls.assert_called_once_with(sk6812.ser, sk6812.baud)
+    assert mock_instance.write_calls == [EXPECTED_RED_FRAME]
 
 
-@patch('sk6812.serial.Serial')
-def test_send_payload_serial_exception(mock_serial, caplog):
+@pytest.mark.parametrize('failure, message', [
+    ('connect', 'Port error'),
+    ('write', 'Write error'),
+])
+def test_send_payload_serial_exception(
+    mock_serial_cls, caplog, red_payload, open_ledstrip, failure, message
+):
     """
-    Verify SerialException during connection logs error and resets ledstrip.
+    Verify SerialException during connection or write logs the error,
+    closes any open connection, and resets ledstrip.
     """
     # Arrange
-    mock_serial.side_effect = sk6812.serial.SerialException('Port error')
-    payload = [
-        {
-            "index": 0,
-            "set": (255, 0, 0, 0),
-            "brightness": 1.0,
-            "effect": "on"
-        }]
-    sk6812.ledstrip = None
+    if failure == 'connect':
+        sk6812.ledstrip = None
+        mock_serial_cls.side_effect = sk6812.serial.SerialException(message)
+    else:
+        mock_ledstrip = open_ledstrip
+        mock_ledstrip.write_side_effect = sk6812.serial.SerialException(
+            message
+        )
+        sk6812.ledstrip = mock_ledstrip
     # Act
     with caplog.at_level('ERROR'):
-        sk6812.send_payload(payload)
+        sk6812.send_payload(red_payload)
     # Assert
-    assert "ERROR: Serial error: Port error" in caplog.text
+    assert f"Serial error: {message}" in caplog.text
     assert sk6812.ledstrip is None
+    if failure == 'write':
+        assert mock_ledstrip.close_calls == 1
 
 
-@patch('sk6812.serial.Serial')
-def test_send_payload_existing_connection(mock_serial, caplog):
+def test_send_payload_existing_connection(
+    mock_serial_cls, caplog, red_payload, open_ledstrip
+):
     """
     Verify existing open connection writes payload without reconnection.
     """
     # Arrange
-    mock_ledstrip = MagicMock()
-    mock_ledstrip.is_open = True
+    mock_ledstrip = open_ledstrip
     sk6812.ledstrip = mock_ledstrip
-    payload = [{
-        "index": 0,
-        "set": (255, 0, 0, 0),
-        "brightness": 1.0,
-        "effect": "on"
-    }]
     # Act
     with caplog.at_level("INFO"):
-        sk6812.send_payload(payload)
+        sk6812.send_payload(red_payload)
     # Assert
-    assert "INFO: reconnected to leds." not in caplog.text
-    mock_ledstrip.write.assert_called_once()
-    mock_serial.assert_not_called()
+    assert 'reconnected to leds' not in caplog.text
+    assert len(mock_ledstrip.write_calls) == 1
+    mock_serial_cls.assert_not_called()
 
 
-@patch("sk6812.serial.Serial")
-def test_send_payload_unexpected_exception(mock_serial, caplog):
+def test_send_payload_unexpected_exception(
+    mock_serial_cls, caplog, red_payload
+):
     """
     Verify unexpected exceptions propagate and log error message.
     """
     # Arrange
     sk6812.ledstrip = None
-    mock_serial.side_effect = Exception("Something went wrong")
-    payload = [{
-        "index": 0,
-        "set": (255, 0, 0, 0),
-        "brightness": 1.0,
-        "effect": "on"
-    }]
+    mock_serial_cls.side_effect = Exception("Something went wrong")
     # Act
     with caplog.at_level("ERROR"):
         with pytest.raises(Exception, match="Something went wrong"):
-            sk6812.send_payload(payload)
-    # Assert
-    assert "ERROR: Unexpected error: Something went wrong" in caplog.text
-
-
-@patch("sk6812.serial.Serial")
-def test_send_payload_serial_exception_with_open_ledstrip(mock_serial, caplog):
-    """
-    Verify SerialException during write closes connection, logs error, and
-    resets ledstrip.
-    """
-    # Arrange
-    mock_ledstrip = MagicMock()
-    mock_ledstrip.is_open = True
-    mock_ledstrip.write.side_effect = sk6812.serial.SerialException(
-        "Write error"
-    )
-    sk6812.ledstrip = mock_ledstrip
-    mock_serial.return_value = mock_ledstrip
-    payload = [{
-        "index": 0,
-        "set": (255, 0, 0, 0),
-        "brightness": 1.0,
-        "effect": "on"
-    }]
-    # Act
-    with caplog.at_level("ERROR"):
-        sk6812.send_payload(payload)
+            sk6812.send_payload(red_payload)
     # Assert
-    mock_ledstrip.close.assert_called_once()
-    assert sk6812.ledstrip is None
-    assert "ERROR: Serial error: Write error" in caplog.text
+    assert "Unexpected error: Something went wrong" in caplog.text
 
 
-@patch("sk6812.serial.Serial")
-def test_send_payload_close_raises_serial_exception(mock_serial, caplog):
+def test_send_payload_close_raises_serial_exception(
+    mock_serial_cls, caplog, red_payload, open_ledstrip
+):
     """
     Verify SerialException during close still resets ledstrip and logs error.
     """
     # Arrange
-    mock_ledstrip = MagicMock()
-    mock_ledstrip.is_open = True
-    mock_ledstrip.write.side_effect = sk6812.serial.SerialException(
+    mock_ledstrip = open_ledstrip
+    mock_ledstrip.write_side_effect = sk6812.serial.SerialException(
         "Write error"
     )
-    mock_ledstrip.close.side_effect = sk6812.serial.SerialException(
+    mock_ledstrip.close_side_effect = sk6812.serial.SerialException(
         "Close failed"
     )
     sk6812.ledstrip = mock_ledstrip
-    mock_serial.return_value = mock_ledstrip
-    payload = [{
-        "index": 0,
-        "set": (255, 0, 0, 0),
-        "brightness": 1.0,
-        "effect": "on"
-    }]
+    mock_serial_cls.return_value = mock_ledstrip
     # Act
     with caplog.at_level("ERROR"):
-        sk6812.send_payload(payload)
+        sk6812.send_payload(red_payload)
     # Assert
-    mock_ledstrip.close.assert_called_once()
+    assert mock_ledstrip.close_calls == 1
     assert sk6812.ledstrip is None